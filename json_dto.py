@@ -1,195 +1,639 @@
 import dataclasses
 import enum
-from datetime import datetime
-from typing import get_type_hints
+import re
+import types
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Union, get_type_hints
 
 DEFAULT_DATE_FORMAT = '%Y-%m-%d %H:%M:%S%z'
 
+_PRIMITIVES = frozenset({str, int, bool, float, dict, list})
 
+# type of `X | None` annotations on python >=3.10
+_UNION_TYPE = getattr(types, 'UnionType', None)
+
+# DEFAULT_DATE_FORMAT exactly as serialize_datetime writes it; anything else goes through strptime
+_DATETIME_PATTERN = re.compile(r'(\d{4})-(\d{2})-(\d{2}) (\d{2}):(\d{2}):(\d{2})([+-]\d{2}[0-5]\d)', re.ASCII)
+_TIMEZONES = {'+0000': timezone.utc, '-0000': timezone.utc}
+_TZ_SUFFIXES = {}
+_MINUTE = timedelta(minutes=1)
+
+
+@lru_cache(maxsize=1024)
 def is_generic_list(type_):
-    if hasattr(type_, '__extra__'):
-        # python 3.5/3.6
-        return type_.__extra__ == list
-    elif hasattr(type_, '__origin__'):
-        # python >=3.7
-        return type_.__origin__ == list
+    return getattr(type_, '__origin__', None) is list
 
 
+@lru_cache(maxsize=1024)
 def is_generic_dict(type_):
-    if hasattr(type_, '__extra__'):
-        # python 3.5/3.6
-        return type_.__extra__ == dict
-    elif hasattr(type_, '__origin__'):
-        # python >=3.7
-        return type_.__origin__ == dict
+    return getattr(type_, '__origin__', None) is dict
+
+
+@lru_cache(maxsize=1024)
+def _optional_type(type_):
+    # X for Optional[X], None for anything else
+    args = getattr(type_, '__args__', ())
+    is_union = getattr(type_, '__origin__', None) is Union or type(type_) is _UNION_TYPE
+    if is_union and len(args) == 2 and type(None) in args:
+        return args[0] if args[1] is type(None) else args[1]
+    return None
+
+
+@lru_cache(maxsize=None)
+def _cached_type_hints(cls) -> dict:
+    return get_type_hints(cls)
+
+
+@lru_cache(maxsize=None)
+def _cached_fields(cls) -> tuple:
+    return dataclasses.fields(cls)
+
+
+(_KIND_PRIMITIVE, _KIND_DATETIME, _KIND_LIST, _KIND_DICT, _KIND_ENUM, _KIND_NESTED, _KIND_OPTIONAL,
+ _KIND_UNSUPPORTED) = range(8)
+
+# type -> kind, so the issubclass MRO walks run once per type
+_TYPE_KINDS = {}
+
+
+def _classify(type_) -> int:
+    origin = getattr(type_, '__origin__', None)
+    if type_ in _PRIMITIVES:
+        return _KIND_PRIMITIVE
+    elif type_ == datetime:
+        return _KIND_DATETIME
+    elif origin is list:
+        return _KIND_LIST
+    elif origin is dict:
+        return _KIND_DICT
+    elif isinstance(type_, type) and issubclass(type_, enum.Enum):
+        return _KIND_ENUM
+    elif isinstance(type_, type) and issubclass(type_, JsonDto):
+        return _KIND_NESTED
+    elif _optional_type(type_) is not None:
+        return _KIND_OPTIONAL
+    else:
+        return _KIND_UNSUPPORTED
+
+
+def _kind_of(type_) -> int:
+    kind = _TYPE_KINDS.get(type_)
+    if kind is None:
+        kind = _TYPE_KINDS[type_] = _classify(type_)
+    return kind
+
+
+def _format_tz(offset: timedelta):
+    # %z as strftime writes it, None for sub-minute offsets that strftime has to handle
+    if offset is None:
+        return ''
+    if offset % _MINUTE:
+        return None
+    sign = '-' if offset < timedelta(0) else '+'
+    hours, minutes = divmod(abs(offset) // _MINUTE, 60)
+    return f'{sign}{hours:02d}{minutes:02d}'
+
+
+def _tz_suffix(value: datetime):
+    tz = value.tzinfo
+    if tz is None:
+        return ''
+    elif tz is timezone.utc:
+        return '+0000'
+    elif type(tz) is timezone:
+        # fixed offset, so the suffix can be cached; other tzinfos may depend on the date
+        try:
+            return _TZ_SUFFIXES[tz]
+        except KeyError:
+            suffix = _TZ_SUFFIXES[tz] = _format_tz(tz.utcoffset(None))
+            return suffix
+    return _format_tz(value.utcoffset())
+
+
+def _parse_tz(value: str) -> timezone:
+    tz = _TIMEZONES.get(value)
+    if tz is None:
+        offset = timedelta(hours=int(value[1:3]), minutes=int(value[3:5]))
+        tz = _TIMEZONES[value] = timezone(-offset if value[0] == '-' else offset)
+    return tz
+
+
+def _parse_datetime(value: str) -> datetime:
+    match = _DATETIME_PATTERN.fullmatch(value)
+    if match is None:
+        return datetime.strptime(value, DEFAULT_DATE_FORMAT)
+    year, month, day, hour, minute, second, tz = match.groups()
+    try:
+        return datetime(int(year), int(month), int(day), int(hour), int(minute), int(second), tzinfo=_parse_tz(tz))
+    except ValueError:
+        # out of range parts, let strptime reject them with its own message
+        return datetime.strptime(value, DEFAULT_DATE_FORMAT)
+
+
+def serialize_datetime(value: datetime):
+    suffix = _tz_suffix(value)
+    if suffix is None or value.year < 1000:
+        # strftime doesn't zero-pad such years and writes seconds for sub-minute offsets
+        return value.strftime(DEFAULT_DATE_FORMAT)
+    return '%04d-%02d-%02d %02d:%02d:%02d%s' % (
+        value.year, value.month, value.day, value.hour, value.minute, value.second, suffix
+    )
+
+
+def serialize_enum(value: enum.Enum):
+    # the plain member attribute behind the Enum.name property
+    return value._name_
+
+
+def serialize_nested(value):
+    return value.to_json()
+
+
+def deserialize_datetime(value: str):
+    if isinstance(value, datetime):
+        # nothing to do here
+        return value
+    try:
+        return _parse_datetime(value) if value else None
+    except ValueError as e:
+        # todo: handle it some other way
+        print(f'Error while deserializing date {str(e)}')
+        return None
+
+
+def deserialize_enum(value: str, enum_class: enum.Enum):
+    # same lookup as enum_class[value] without EnumMeta.__getitem__
+    return enum_class._member_map_[value]
+
+
+def deserialize_nested(value: dict, nested_class):
+    return nested_class.from_json(value)
+
+
+def deserialize(type_, value):
+    if value is None:
+        return None
+    kind = _kind_of(type_)
+    if kind == _KIND_PRIMITIVE:
+        return type_(value)
+    elif kind == _KIND_DATETIME:
+        return deserialize_datetime(value)
+    elif kind == _KIND_LIST or kind == _KIND_DICT:
+        # item types are fixed, so resolve their handlers once rather than per item
+        return _resolve_decoder(type_)(value)
+    elif kind == _KIND_ENUM:
+        return deserialize_enum(value, type_)
+    elif kind == _KIND_NESTED:
+        return deserialize_nested(value, type_)
+    elif kind == _KIND_OPTIONAL:
+        return deserialize(_optional_type(type_), value)
+    else:
+        raise NotImplementedError(f'Deserializer for {str(type_)} not implemented yet')
+
+
+def _enc_passthrough(value):
+    return value
+
+
+# declared type -> serializer, used when the value is exactly of that type
+_FAST_SERIALIZE = {
+    str: _enc_passthrough,
+    int: _enc_passthrough,
+    bool: _enc_passthrough,
+    float: _enc_passthrough,
+    datetime: serialize_datetime,
+}
+
+
+def _enc_list(inner_enc):
+    if inner_enc is _enc_passthrough:
+        # items are already JSON values, copy them in C
+        return list
+    if inner_enc is serialize_enum:
+        def encode(value):
+            return [v._name_ if v is not None else None for v in value]
+        return encode
+    if inner_enc is serialize_nested:
+        def encode(value):
+            return [v.to_json() if v is not None else None for v in value]
+        return encode
+
+    def encode(value):
+        return [inner_enc(v) if v is not None else None for v in value]
+    return encode
+
+
+def _enc_dict(key_enc, val_enc):
+    if key_enc is _enc_passthrough and val_enc is _enc_passthrough:
+        return dict
+
+    def encode(value):
+        return {
+            key_enc(key) if key is not None else None: val_enc(val) if val is not None else None
+            for key, val in value.items()
+        }
+    return encode
+
+
+def _enc_unsupported(type_):
+    def encode(value):
+        raise NotImplementedError(f'Serializer for {str(type_)} not implemented yet')
+    return encode
+
+
+@lru_cache(maxsize=None)
+def _resolve_encoder(type_):
+    kind = _kind_of(type_)
+    if kind == _KIND_PRIMITIVE:
+        return _enc_passthrough
+    elif kind == _KIND_DATETIME:
+        return serialize_datetime
+    elif kind == _KIND_LIST:
+        return _enc_list(_resolve_encoder(type_.__args__[0]))
+    elif kind == _KIND_DICT:
+        return _enc_dict(_resolve_encoder(type_.__args__[0]), _resolve_encoder(type_.__args__[1]))
+    elif kind == _KIND_ENUM:
+        return serialize_enum
+    elif kind == _KIND_NESTED:
+        return serialize_nested
+    elif kind == _KIND_OPTIONAL:
+        # None never reaches a handler, so Optional[X] is handled as X
+        return _resolve_encoder(_optional_type(type_))
+    else:
+        # raise on first non-None value, not at compile time
+        return _enc_unsupported(type_)
+
+
+def _generic_encoder(cls):
+    # per-field loop through self.serialize_value, for subclasses that override it
+    hints = tuple(cls.get_type_hints().items())
+
+    def encode(self):
+        result = {}
+        for name, type_ in hints:
+            value = self.serialize_value(getattr(self, name), type_)
+            if value is not None:
+                result[name] = value
+        return result
+    return encode
+
+
+def _compile_encoder(cls):
+    if cls.serialize_value is not JsonDto.serialize_value:
+        return _generic_encoder(cls)
+    namespace = {}
+    lines = ['def encode(self):', '    result = {}']
+    for index, (name, type_) in enumerate(cls.get_type_hints().items()):
+        encoder = _resolve_encoder(type_)
+        if encoder is _enc_passthrough:
+            expression = 'value'
+        elif encoder is serialize_nested:
+            # call the nested to_json directly, one frame less per nesting level
+            expression = 'value.to_json()'
+        else:
+            expression = f'_enc_{index}(value)'
+            namespace[f'_enc_{index}'] = encoder
+        # plain attribute loads get specialized by the interpreter; a single
+        # operator.attrgetter(*names) call plus unpacking measured slower.
+        # The None check stays for every field, Optional or not: fields default
+        # to None to mean "absent" and the JSON schema doesn't allow null.
+        lines += [
+            f'    value = self.{name}',
+            '    if value is not None:',
+            f'        result[{name!r}] = {expression}',
+        ]
+    lines.append('    return result')
+    exec('\n'.join(lines), namespace)
+    return namespace['encode']
+
+
+def _dec_enum(enum_class):
+    return enum_class._member_map_.__getitem__
+
+
+def _dec_nested(nested_class):
+    # the bound classmethod itself, one frame less per nesting level
+    return nested_class.from_json
+
+
+def _dec_list(inner_dec):
+    def decode(value):
+        return [inner_dec(v) if v is not None else None for v in value]
+
+    if inner_dec in _PRIMITIVES:
+        def decode_primitives(value):
+            # map() runs the conversion loop in C; None items must not reach the converter.
+            # Only pre-scan real lists, other iterables may be single-use
+            if type(value) is not list or None in value:
+                return decode(value)
+            return list(map(inner_dec, value))
+        return decode_primitives
+    return decode
+
+
+def _dec_dict(key_dec, val_dec):
+    def decode(value):
+        return {
+            key_dec(key) if key is not None else None: val_dec(val) if val is not None else None
+            for key, val in value.items()
+        }
+
+    if key_dec in _PRIMITIVES and val_dec in _PRIMITIVES:
+        def decode_primitives(value):
+            if type(value) is not dict or None in value or None in value.values():
+                return decode(value)
+            return dict(zip(map(key_dec, value.keys()), map(val_dec, value.values())))
+        return decode_primitives
+    return decode
+
+
+def _dec_unsupported(type_):
+    def decode(value):
+        raise NotImplementedError(f'Deserializer for {str(type_)} not implemented yet')
+    return decode
+
+
+@lru_cache(maxsize=None)
+def _resolve_decoder(type_):
+    kind = _kind_of(type_)
+    if kind == _KIND_PRIMITIVE:
+        # the type itself is the converter
+        return type_
+    elif kind == _KIND_DATETIME:
+        return deserialize_datetime
+    elif kind == _KIND_LIST:
+        return _dec_list(_resolve_decoder(type_.__args__[0]))
+    elif kind == _KIND_DICT:
+        return _dec_dict(_resolve_decoder(type_.__args__[0]), _resolve_decoder(type_.__args__[1]))
+    elif kind == _KIND_ENUM:
+        return _dec_enum(type_)
+    elif kind == _KIND_NESTED:
+        return _dec_nested(type_)
+    elif kind == _KIND_OPTIONAL:
+        return _resolve_decoder(_optional_type(type_))
+    else:
+        return _dec_unsupported(type_)
+
+
+def _is_generated_init(cls, fields) -> bool:
+    # @dataclass keeps an __init__ written in the class body, and an undecorated
+    # subclass may override it. The generated one is exec'd inside a
+    # __create_fn__ factory and takes exactly the init fields.
+    code = getattr(cls.__dict__.get('__init__'), '__code__', None)
+    if code is None or code.co_filename != '<string>':
+        return False
+    if getattr(code, 'co_qualname', '__create_fn__.<locals>.__init__') != '__create_fn__.<locals>.__init__':
+        return False
+    params = code.co_varnames[:code.co_argcount + code.co_kwonlyargcount]
+    return params == ('self', *(field.name for field in fields))
+
+
+def _has_data_descriptor(cls, name: str) -> bool:
+    for klass in cls.__mro__:
+        if name in klass.__dict__:
+            attr_type = type(klass.__dict__[name])
+            return hasattr(attr_type, '__set__') or hasattr(attr_type, '__delete__')
+    return False
+
+
+def _can_skip_init(cls, hints: dict) -> bool:
+    # True when the dataclass __init__ would do nothing but store the hinted fields in __dict__
+    if not dataclasses.is_dataclass(cls) or not cls.__dataclass_params__.init:
+        return False
+    if hasattr(cls, '__post_init__') or hasattr(cls, '__slots__') or cls.__new__ is not object.__new__:
+        return False
+    # frozen dataclasses assign through object.__setattr__, everything else through cls.__setattr__
+    if not cls.__dataclass_params__.frozen and cls.__setattr__ is not object.__setattr__:
+        return False
+    fields = _cached_fields(cls)
+    if not all(field.init for field in fields) or {field.name for field in fields} != hints.keys():
+        return False
+    # properties and other data descriptors must see the assignment
+    if any(_has_data_descriptor(cls, field.name) for field in fields):
+        return False
+    return _is_generated_init(cls, fields)
+
+
+def _compile_decoder(cls):
+    hints = cls.get_type_hints()
+    skip_init = _can_skip_init(cls, hints)
+    fields = {field.name: field for field in _cached_fields(cls)} if dataclasses.is_dataclass(cls) else {}
+    namespace = {'_new': object.__new__}
+    lines = ['def decode(cls, payload):', '    kwargs = {}', '    missing = False']
+    for index, (name, type_) in enumerate(hints.items()):
+        handler = f'_dec_{index}'
+        namespace[handler] = _resolve_decoder(type_)
+        field = fields.get(name)
+        decode = f'        kwargs[{name!r}] = {handler}(value) if value is not None else None'
+        has_default = field is not None and not (field.default is field.default_factory is dataclasses.MISSING)
+        if field is not None and not has_default and _optional_type(type_) is not None:
+            # to_json leaves None out, so an absent Optional field without a default is None
+            lines += [
+                f'    if {name!r} in payload:',
+                f'        value = payload[{name!r}]',
+                decode,
+                '    else:',
+                f'        kwargs[{name!r}] = None',
+            ]
+        elif field is not None and not has_default:
+            # required fields are in every valid payload, so look them up once
+            # and only pay for the exception when one is missing
+            lines += [
+                '    try:',
+                f'        value = payload[{name!r}]',
+                '    except KeyError:',
+                '        missing = True',
+                '    else:',
+                decode,
+            ]
+        else:
+            # optional fields are often left out (to_json drops None values),
+            # where `in` is cheaper than a KeyError
+            lines += [
+                f'    if {name!r} in payload:',
+                f'        value = payload[{name!r}]',
+                decode,
+            ]
+            if skip_init:
+                # fill in defaults the way the dataclass __init__ would
+                if field.default is not dataclasses.MISSING:
+                    namespace[f'_default_{index}'] = field.default
+                    lines += ['    else:', f'        kwargs[{name!r}] = _default_{index}']
+                else:
+                    namespace[f'_factory_{index}'] = field.default_factory
+                    lines += ['    else:', f'        kwargs[{name!r}] = _factory_{index}()']
+    if skip_init:
+        lines += [
+            '    if not missing:',
+            '        obj = _new(cls)',
+            '        obj.__dict__.update(kwargs)',
+            '        return obj',
+        ]
+    # let __init__ run, or raise its error for missing arguments
+    lines.append('    return cls(**kwargs)')
+    exec('\n'.join(lines), namespace)
+    return namespace['decode']
+
+
+# Schemas are static per class, so they are built once. The cached dicts are
+# private: the JsonDto classmethods hand out copies, so callers can't change
+# each other's (or a parent schema's) result. Plain dicts rather than read-only
+# mapping proxies, which json.dumps and jsonschema reject.
+def _copy_schema(value):
+    # schemas only hold dicts, lists of strings and strings
+    if type(value) is list:
+        return list(value)
+    return {
+        key: _copy_schema(val) if type(val) is dict or type(val) is list else val
+        for key, val in value.items()
+    }
+
+
+def _object_schema(schema: dict, required: list) -> dict:
+    # draft-04 doesn't allow an empty "required" array, leave it out instead
+    if required:
+        schema['required'] = required
+    return schema
+
+
+@lru_cache(maxsize=None)
+def _schema_properties(cls):
+    types_map = {
+        int: 'integer',
+        float: 'number',
+        str: 'string',
+        bool: 'boolean',
+        datetime: 'string',
+        enum.Enum: 'string',
+        list: 'array',
+        dict: 'object'
+    }
+
+    def get_field_type(field: dataclasses.Field) -> dict:
+        # None values are left out of the payload, so Optional[X] is described as X
+        type_ = _optional_type(field.type) or field.type
+        if type_ in types_map:
+            return {'type': types_map.get(type_)}
+        elif isinstance(type_, type) and issubclass(type_, JsonDto):
+            return {'type': 'object', 'properties': type_.get_schema_properties()}
+        elif is_generic_list(type_):
+            generic_type = type_.__args__[0]
+            if generic_type in types_map:
+                return {'type': 'array', 'items': {'type': types_map[generic_type]}}
+            else:
+                return {'type': 'array',
+                        'items': {'type': 'object', 'properties': generic_type.get_schema_properties()}}
+        elif is_generic_dict(type_):
+            generic_type = type_.__args__[1]
+            if generic_type in types_map:
+                return {'type': 'object', 'additionalProperties': {'type': types_map[generic_type]}}
+            else:
+                return {
+                    'type': 'object',
+                    'additionalProperties': _object_schema({
+                        'type': 'object',
+                        'properties': generic_type.get_schema_properties(),
+                    }, generic_type.get_schema_required())
+                }
+
+    return {
+        field.name: get_field_type(field) for field in _cached_fields(cls)
+    }
+
+
+@lru_cache(maxsize=None)
+def _schema_required(cls):
+    hints = cls.get_type_hints()
+
+    def is_required(field: dataclasses.Field) -> bool:
+        # absent Optional fields are read back as None
+        if field.default == dataclasses.MISSING and _optional_type(hints.get(field.name, field.type)) is None:
+            return True
+
+    return [field.name for field in _cached_fields(cls) if is_required(field)]
+
+
+@lru_cache(maxsize=None)
+def _json_schema(cls):
+    return _object_schema({
+        "$schema": "http://json-schema.org/draft-04/schema#",
+        "title": cls.__name__,
+        "type": "object",
+        "properties": cls.get_schema_properties(),
+    }, cls.get_schema_required())
 
 
 class JsonDto:
 
     @classmethod
     def get_type_hints(cls) -> dict:
-        # Cache type hints and handle class inheritance
-        hints_field = '_type_hints_' + cls.__name__
-        if getattr(cls, hints_field, None) is None:
-            setattr(cls, hints_field, get_type_hints(cls))
-        return getattr(cls, hints_field)
+        # Cached per class object, so subclasses and same-named classes don't collide
+        return _cached_type_hints(cls)
 
     @staticmethod
     def serialize_value(value, type_):
+        if type(value) is type_:
+            # exact match with the declared type, skip the kind dispatch
+            serializer = _FAST_SERIALIZE.get(type_)
+            if serializer is not None:
+                return serializer(value)
         if value is None:
             return None
-
-        def serialize_datetime(value_: datetime):
-            return value_.strftime(DEFAULT_DATE_FORMAT)
-
-        def serialize_enum(value_: enum.Enum):
-            return value_.name
-
-        def serialize_nested(value_):
-            return value_.to_json()
-
-        if type_ in [str, int, bool, float, dict, list]:
+        kind = _kind_of(type_)
+        if kind == _KIND_PRIMITIVE:
             return value
-        elif type_ == datetime:
+        elif kind == _KIND_DATETIME:
             return serialize_datetime(value)
-        elif is_generic_list(type_):
-            generic_type = type_.__args__[0]
-            return [JsonDto.serialize_value(v, generic_type) for v in value]
-        elif is_generic_dict(type_):
-            key_type = type_.__args__[0]
-            val_type = type_.__args__[1]
-            return {
-                JsonDto.serialize_value(key, key_type): JsonDto.serialize_value(val, val_type)
-                for key, val in value.items()
-            }
-        elif issubclass(type_, enum.Enum):
+        elif kind == _KIND_LIST or kind == _KIND_DICT:
+            # item types are fixed, so resolve their handlers once rather than per item
+            return _resolve_encoder(type_)(value)
+        elif kind == _KIND_ENUM:
             return serialize_enum(value)
-        elif issubclass(type_, JsonDto):
+        elif kind == _KIND_NESTED:
             return serialize_nested(value)
+        elif kind == _KIND_OPTIONAL:
+            return JsonDto.serialize_value(value, _optional_type(type_))
         else:
             raise NotImplementedError(f'Serializer for {str(type_)} not implemented yet')
 
-    def to_json(self):
-        result = {}
+    @classmethod
+    def _get_encoder(cls):
+        # Compiled once per class on first use and kept on the class itself. Read
+        # through __dict__ so a subclass never picks up its parent's encoder.
+        try:
+            return cls.__dict__['_json_dto_encoder']
+        except KeyError:
+            encoder = _compile_encoder(cls)
+            setattr(cls, '_json_dto_encoder', encoder)
+            return encoder
 
-        for name, type_ in self.get_type_hints().items():
-            value = self.serialize_value(getattr(self, name), type_)
-            if value is not None:
-                result[name] = self.serialize_value(getattr(self, name), type_)
+    @classmethod
+    def _get_decoder(cls):
+        try:
+            return cls.__dict__['_json_dto_decoder']
+        except KeyError:
+            decoder = _compile_decoder(cls)
+            setattr(cls, '_json_dto_decoder', decoder)
+            return decoder
 
-        return result
+    def to_json(self):
+        return self._get_encoder()(self)
 
     @classmethod
     def from_json(cls, payload: dict, _class=None):
-
-        def deserialize_datetime(value: str):
-            if isinstance(value, datetime):
-                # nothing to do here
-                return value
-            try:
-                return datetime.strptime(value, DEFAULT_DATE_FORMAT) if value else None
-            except ValueError as e:
-                # todo: handle it some other way
-                print(f'Error while deserializing date {str(e)}')
-                return None
-
-        def deserialize_enum(value: str, enum_class: enum.Enum):
-            return enum_class[value]
-
-        def deserialize_nested(value: str, nested_class):
-            return nested_class.from_json(value)
-
-        def deserialize(type_, value):
-            if value is None:
-                return None
-            if type_ in [str, int, bool, float, dict, list]:
-                return type_(value)
-            elif type_ == datetime:
-                return deserialize_datetime(value)
-            elif is_generic_list(type_):
-                generic_type = type_.__args__[0]
-                return [deserialize(generic_type, v) for v in value]
-            elif is_generic_dict(type_):
-                key_type = type_.__args__[0]
-                val_type = type_.__args__[1]
-                return {
-                    deserialize(key_type, key): deserialize(val_type, val)
-                    for key, val in value.items()
-                }
-            elif issubclass(type_, enum.Enum):
-                return deserialize_enum(value, type_)
-            elif issubclass(type_, JsonDto):
-                return deserialize_nested(value, type_)
-            else:
-                raise NotImplementedError(f'Deserializer for {str(type_)} not implemented yet')
-
         if _class is None:
             _class = cls
-        return _class(
-            **{
-                name: deserialize(type_, payload[name]) for name, type_ in _class.get_type_hints().items()
-                if name in payload
-            }
-        )
+        return _class._get_decoder()(_class, payload)
 
     @classmethod
     def get_schema_properties(cls):
-        types_map = {
-            int: 'integer',
-            float: 'number',
-            str: 'string',
-            bool: 'boolean',
-            datetime: 'string',
-            enum.Enum: 'string',
-            list: 'array',
-            dict: 'object'
-        }
-
-        def get_field_type(field: dataclasses.Field) -> dict:
-            if field.type in types_map:
-                return {'type': types_map.get(field.type)}
-            elif isinstance(field.type, JsonDto):
-                return {'type': 'object', 'properties': field.type.get_schema_properties()}
-            elif is_generic_list(field.type):
-                generic_type = field.type.__args__[0]
-                if generic_type in types_map:
-                    return {'type': 'array', 'items': {'type': types_map[generic_type]}}
-                else:
-                    return {'type': 'array',
-                            'items': {'type': 'object', 'properties': generic_type.get_schema_properties()}}
-            elif is_generic_dict(field.type):
-                generic_type = field.type.__args__[1]
-                if generic_type in types_map:
-                    return {'type': 'object', 'additionalProperties': {'type': types_map[generic_type]}}
-                else:
-                    return {
-                        'type': 'object',
-                        'additionalProperties': {
-                            'type': 'object',
-                            'properties': generic_type.get_schema_properties(),
-                            'required': generic_type.get_schema_required()
-                        }
-                    }
-
-        return {
-            field.name: get_field_type(field) for field in dataclasses.fields(cls)
-        }
+        return _copy_schema(_schema_properties(cls))
 
     @classmethod
     def get_schema_required(cls):
-        def is_required(field: dataclasses.Field) -> bool:
-            if field.default == dataclasses.MISSING:
-                return True
-
-        return [field.name for field in dataclasses.fields(cls) if is_required(field)]
+        return _copy_schema(_schema_required(cls))
 
     @classmethod
     def get_json_schema(cls):
-
-        return {
-            "$schema": "http://json-schema.org/draft-04/schema#",
-            "title": cls.__name__,
-            "type": "object",
-            "properties": cls.get_schema_properties(),
-            "required": cls.get_schema_required()
-        }
+        return _copy_schema(_json_schema(cls))
@@ -1,12 +1,19 @@
+import enum
+import io
+import sys
+import timeit
+from contextlib import redirect_stdout
 from dataclasses import dataclass, field
-from unittest import TestCase
+from datetime import datetime, timezone, timedelta
+from unittest import TestCase, skipIf
 
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 import jsonschema
 from jsonschema import ValidationError
 
-from json_dto import JsonDto
+import json_dto
+from json_dto import DEFAULT_DATE_FORMAT, JsonDto, deserialize
 
 
 class JsonDtoTest(TestCase):
@@ -70,6 +77,366 @@ class JsonDtoTest(TestCase):
         # then
         self.assertEqual(deserialized, payload)
 
+    def test_handle_nested_json_dto_enum_and_datetime(self):
+        # given
+        class Color(enum.Enum):
+            RED = 1
+            GREEN = 2
+
+        @dataclass
+        class SimpleDto(JsonDto):
+            id: int
+            color: Color
+
+        @dataclass
+        class NestedDto(JsonDto):
+            created: datetime
+            nested: SimpleDto
+            colors: List[Color]
+            note: str = None
+
+        payload = NestedDto(
+            created=datetime(2020, 5, 17, 13, 45, 10, tzinfo=timezone(timedelta(hours=2))),
+            nested=SimpleDto(1, Color.GREEN),
+            colors=[Color.RED, Color.GREEN],
+        )
+
+        # when
+        serialized = payload.to_json()
+        deserialized = NestedDto.from_json(serialized)
+
+        # then
+        self.assertEqual(serialized, {
+            'created': '2020-05-17 13:45:10+0200',
+            'nested': {'id': 1, 'color': 'GREEN'},
+            'colors': ['RED', 'GREEN'],
+        })
+        self.assertEqual(deserialized, payload)
+
+    def test_to_json_uses_overridden_serialize_value(self):
+        # given
+        @dataclass
+        class CustomDto(JsonDto):
+            my_int: int
+
+            @staticmethod
+            def serialize_value(value, type_):
+                return 'overridden'
+
+        # when
+        serialized = CustomDto(1).to_json()
+
+        # then
+        self.assertEqual(serialized, {'my_int': 'overridden'})
+
+    def test_handle_datetime_formats(self):
+        # given
+        @dataclass
+        class DatetimeDto(JsonDto):
+            my_datetime: datetime
+
+        utc = DatetimeDto(datetime(2020, 5, 17, 13, 45, 10, tzinfo=timezone.utc))
+        negative = DatetimeDto(datetime(1999, 12, 31, 23, 59, 59, tzinfo=timezone(timedelta(hours=-5, minutes=-30))))
+
+        # when
+        serialized = [utc.to_json(), negative.to_json()]
+        deserialized = [DatetimeDto.from_json(payload) for payload in serialized]
+        # non canonical input falls back to strptime
+        lenient = DatetimeDto.from_json({'my_datetime': '2020-5-17 13:45:10+02:00'})
+
+        # then
+        self.assertEqual(serialized, [
+            {'my_datetime': '2020-05-17 13:45:10+0000'},
+            {'my_datetime': '1999-12-31 23:59:59-0530'},
+        ])
+        self.assertEqual(deserialized, [utc, negative])
+        self.assertEqual(lenient.my_datetime, datetime(2020, 5, 17, 13, 45, 10, tzinfo=timezone(timedelta(hours=2))))
+
+    def test_invalid_datetime_reports_strptime_error(self):
+        # given
+        @dataclass
+        class DatetimeDto(JsonDto):
+            my_datetime: datetime
+
+        invalid = ['2020-13-01 00:00:00+0000', '2020-02-30 10:00:00+0000', '2020-05-17 13:45:10+2400']
+
+        for value in invalid:
+            with self.subTest(value=value):
+                try:
+                    datetime.strptime(value, DEFAULT_DATE_FORMAT)
+                except ValueError as e:
+                    expected = f'Error while deserializing date {str(e)}\n'
+
+                # when
+                output = io.StringIO()
+                with redirect_stdout(output):
+                    deserialized = DatetimeDto.from_json({'my_datetime': value})
+
+                # then
+                self.assertIsNone(deserialized.my_datetime)
+                self.assertEqual(output.getvalue(), expected)
+
+    def test_handle_optional_fields(self):
+        # given
+        @dataclass
+        class SimpleDto(JsonDto):
+            id: int
+
+        @dataclass
+        class OptionalDto(JsonDto):
+            my_int: Optional[int] = None
+            my_nested: Optional[SimpleDto] = None
+            my_list: Optional[List[datetime]] = None
+
+        payload = OptionalDto(my_nested=SimpleDto(1), my_list=[datetime(2020, 5, 17, tzinfo=timezone.utc)])
+
+        # when
+        serialized = payload.to_json()
+        deserialized = OptionalDto.from_json(serialized)
+
+        # then
+        self.assertEqual(serialized, {'my_nested': {'id': 1}, 'my_list': ['2020-05-17 00:00:00+0000']})
+        self.assertEqual(deserialized, payload)
+
+    def test_from_json_fills_defaults_and_runs_post_init(self):
+        # given
+        @dataclass
+        class DefaultsDto(JsonDto):
+            my_int: int
+            my_str: str = 'foo'
+            my_list: List[int] = field(default_factory=list)
+
+        @dataclass
+        class PostInitDto(JsonDto):
+            my_int: int
+
+            def __post_init__(self):
+                self.my_int *= 2
+
+        # when
+        deserialized = DefaultsDto.from_json({'my_int': 1})
+        post_init = PostInitDto.from_json({'my_int': 1})
+
+        # then
+        self.assertEqual(deserialized, DefaultsDto(1, 'foo', []))
+        self.assertEqual(post_init.my_int, 2)
+        with self.assertRaises(TypeError):
+            DefaultsDto.from_json({'my_str': 'bar'})
+
+    def test_from_json_runs_custom_init_of_dataclass(self):
+        # given
+        @dataclass
+        class CustomInitDto(JsonDto):
+            my_int: int
+
+            def __init__(self, my_int):
+                self.my_int = my_int * 10
+
+        # when
+        deserialized = CustomInitDto.from_json({'my_int': 1})
+
+        # then
+        self.assertEqual(deserialized.my_int, 10)
+
+    def test_from_json_runs_custom_setattr(self):
+        # given
+        @dataclass
+        class SetattrDto(JsonDto):
+            my_int: int
+
+            def __setattr__(self, name, value):
+                super().__setattr__(name, value * 2)
+
+        # when
+        deserialized = SetattrDto.from_json({'my_int': 1})
+
+        # then
+        self.assertEqual(deserialized.my_int, SetattrDto(1).my_int)
+        self.assertEqual(deserialized.my_int, 2)
+
+    def test_from_json_assigns_through_descriptor_fields(self):
+        # given
+        @dataclass
+        class PropertyDto(JsonDto):
+            my_int: int
+
+        def set_my_int(self, value):
+            self._my_int = value + 1
+
+        PropertyDto.my_int = property(lambda self: self._my_int, set_my_int)
+
+        # when
+        deserialized = PropertyDto.from_json({'my_int': 1})
+
+        # then
+        self.assertEqual(deserialized.my_int, 2)
+
+    def test_from_json_runs_init_of_undecorated_subclass(self):
+        # given
+        @dataclass
+        class SimpleDto(JsonDto):
+            my_int: int
+
+        class ExtraDto(SimpleDto):
+            def __init__(self, my_int):
+                super().__init__(my_int)
+                self.extra = True
+
+        # when
+        deserialized = ExtraDto.from_json({'my_int': 1})
+
+        # then
+        self.assertEqual(deserialized.my_int, 1)
+        self.assertTrue(deserialized.extra)
+
+    @skipIf(sys.version_info < (3, 10), 'X | None annotations need python 3.10')
+    def test_handle_pep604_optional_fields(self):
+        # given
+        @dataclass
+        class OptionalDto(JsonDto):
+            my_int: int | None = None
+            my_datetime: datetime | None = None
+
+        payload = OptionalDto(my_datetime=datetime(2020, 5, 17, tzinfo=timezone.utc))
+
+        # when
+        serialized = payload.to_json()
+        deserialized = OptionalDto.from_json(serialized)
+
+        # then
+        self.assertEqual(serialized, {'my_datetime': '2020-05-17 00:00:00+0000'})
+        self.assertEqual(deserialized, payload)
+
+    def test_optional_fields_json_schema(self):
+        # given
+        @dataclass
+        class SimpleDto(JsonDto):
+            id: int
+
+        @dataclass
+        class OptionalDto(JsonDto):
+            id: int
+            my_str: Optional[str]
+            my_int: Optional[int] = None
+            my_nested: Optional[SimpleDto] = None
+            my_list: Optional[List[str]] = None
+
+        result = {
+            "$schema": "http://json-schema.org/draft-04/schema#",
+            "title": "OptionalDto",
+            "type": "object",
+            "properties": {
+                'id': {'type': 'integer'},
+                'my_str': {'type': 'string'},
+                'my_int': {'type': 'integer'},
+                'my_nested': {'type': 'object', 'properties': {'id': {'type': 'integer'}}},
+                'my_list': {'type': 'array', 'items': {'type': 'string'}},
+            },
+            "required": ['id']
+        }
+
+        # when
+        schema = OptionalDto.get_json_schema()
+
+        # then
+        self.assertEqual(schema, result)
+        self.assertIsNone(jsonschema.validate(OptionalDto(1, 'foo', my_nested=SimpleDto(1)).to_json(), schema))
+
+    def test_optional_field_without_default_round_trip(self):
+        # given
+        @dataclass
+        class OptionalDto(JsonDto):
+            my_str: Optional[str]
+
+        @dataclass
+        class PlainDto(JsonDto):
+            my_str: Optional[str]
+
+            def __post_init__(self):
+                pass
+
+        for dto_class in (OptionalDto, PlainDto):
+            with self.subTest(dto_class=dto_class.__name__):
+                # when
+                payload = dto_class(None).to_json()
+                schema = dto_class.get_json_schema()
+
+                # then
+                self.assertEqual(payload, {})
+                self.assertNotIn('required', schema)
+                self.assertIsNone(jsonschema.validate(payload, schema))
+                self.assertEqual(dto_class.from_json(payload), dto_class(None))
+                self.assertEqual(dto_class.from_json({'my_str': 'foo'}), dto_class('foo'))
+
+    def test_serialize_value(self):
+        # given
+        class Color(enum.Enum):
+            RED = 1
+            GREEN = 2
+
+        @dataclass
+        class SimpleDto(JsonDto):
+            id: int
+
+        created = datetime(2020, 5, 17, 13, 45, 10, tzinfo=timezone.utc)
+
+        # then
+        self.assertEqual(JsonDto.serialize_value('foo', str), 'foo')
+        self.assertEqual(JsonDto.serialize_value(1, int), 1)
+        self.assertEqual(JsonDto.serialize_value(True, int), True)
+        self.assertIsNone(JsonDto.serialize_value(None, int))
+        self.assertEqual(JsonDto.serialize_value(created, datetime), '2020-05-17 13:45:10+0000')
+        # the declared type decides, not the value type
+        self.assertIs(JsonDto.serialize_value(created, str), created)
+        self.assertEqual(JsonDto.serialize_value([Color.RED, None, Color.GREEN], List[Color]), ['RED', None, 'GREEN'])
+        self.assertEqual(JsonDto.serialize_value(SimpleDto(1), Optional[SimpleDto]), {'id': 1})
+        self.assertIsNone(JsonDto.serialize_value(None, Optional[SimpleDto]))
+
+    def test_deserialize(self):
+        # given
+        class Color(enum.Enum):
+            RED = 1
+            GREEN = 2
+
+        @dataclass
+        class SimpleDto(JsonDto):
+            id: int
+
+        # then
+        self.assertEqual(deserialize(int, '1'), 1)
+        self.assertIsNone(deserialize(int, None))
+        self.assertEqual(deserialize(datetime, '2020-05-17 13:45:10+0000'),
+                         datetime(2020, 5, 17, 13, 45, 10, tzinfo=timezone.utc))
+        self.assertEqual(deserialize(Color, 'GREEN'), Color.GREEN)
+        self.assertEqual(deserialize(List[int], ['1', None, 2]), [1, None, 2])
+        self.assertEqual(deserialize(List[Color], ['RED', None]), [Color.RED, None])
+        self.assertEqual(deserialize(Dict[str, SimpleDto], {'a': {'id': 1}}), {'a': SimpleDto(1)})
+        self.assertEqual(deserialize(SimpleDto, {'id': 1}), SimpleDto(1))
+        self.assertEqual(deserialize(Optional[SimpleDto], {'id': 1}), SimpleDto(1))
+        with self.assertRaises(KeyError):
+            deserialize(Color, 'BLUE')
+        with self.assertRaises(NotImplementedError):
+            deserialize(set, [1])
+
+    def test_handle_primitive_containers_from_iterables(self):
+        # given
+        @dataclass
+        class ContainerDto(JsonDto):
+            my_list: List[int]
+            my_dict: Dict[str, int]
+
+        class Mapping(dict):
+            pass
+
+        # when
+        deserialized = ContainerDto.from_json({
+            'my_list': (v for v in ['1', '2']),
+            'my_dict': Mapping(a='1', b='2'),
+        })
+
+        # then
+        self.assertEqual(deserialized, ContainerDto([1, 2], {'a': 1, 'b': 2}))
+
     def test_handle_json_schema(self):
         # given
         @dataclass
@@ -139,6 +506,86 @@ class JsonDtoTest(TestCase):
         # then
         self.assertEqual(schema, result)
 
+    def test_nested_dto_json_schema(self):
+        # given
+        @dataclass
+        class SimpleDto(JsonDto):
+            id: int
+
+        @dataclass
+        class NestedDto(JsonDto):
+            my_nested: SimpleDto
+
+        result = {
+            "$schema": "http://json-schema.org/draft-04/schema#",
+            "title": "NestedDto",
+            "type": "object",
+            "properties": {
+                'my_nested': {'type': 'object', 'properties': {'id': {'type': 'integer'}}},
+            },
+            "required": ['my_nested']
+        }
+
+        # when
+        schema = NestedDto.get_json_schema()
+
+        # then
+        self.assertEqual(schema, result)
+
+    def test_json_schema_result_can_be_modified(self):
+        # given
+        @dataclass
+        class SimpleDto(JsonDto):
+            id: int
+
+        @dataclass
+        class NestedDto(JsonDto):
+            my_nested: SimpleDto
+
+        NestedDto.get_json_schema()
+        schema = SimpleDto.get_json_schema()
+
+        # when
+        schema['properties']['id']['type'] = 'string'
+        schema['required'].append('foo')
+        NestedDto.get_json_schema()['properties']['my_nested']['properties']['id']['type'] = 'string'
+
+        # then
+        self.assertEqual(SimpleDto.get_json_schema()['properties'], {'id': {'type': 'integer'}})
+        self.assertEqual(SimpleDto.get_schema_required(), ['id'])
+        self.assertEqual(NestedDto.get_json_schema()['properties']['my_nested'],
+                         {'type': 'object', 'properties': {'id': {'type': 'integer'}}})
+
+    def test_cached_json_schema_is_cheaper_than_rebuilding_it(self):
+        # given
+        @dataclass
+        class PrimitiveDto(JsonDto):
+            my_int: int
+            my_str: str
+            my_float: float
+            my_bool: bool = None
+            my_dict: dict = None
+            my_list: List[int] = field(default_factory=list)
+
+        def rebuild():
+            # what get_json_schema did before schemas were cached
+            return {
+                "$schema": "http://json-schema.org/draft-04/schema#",
+                "title": PrimitiveDto.__name__,
+                "type": "object",
+                "properties": json_dto._schema_properties.__wrapped__(PrimitiveDto),
+                "required": json_dto._schema_required.__wrapped__(PrimitiveDto)
+            }
+
+        self.assertEqual(PrimitiveDto.get_json_schema(), rebuild())
+
+        # when
+        cached = min(timeit.repeat(PrimitiveDto.get_json_schema, number=2000, repeat=5))
+        rebuilt = min(timeit.repeat(rebuild, number=2000, repeat=5))
+
+        # then
+        self.assertLess(cached, rebuilt)
+
     def test_nested_dict_dto_json_schema(self):
         # given
         @dataclass